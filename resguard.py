@@ -217,24 +217,38 @@ class Root:
 That's it, check below for function docs
 """
 
+# Keep the imports here cheap, resguard is used in short lived processes
+# where import time matters. Anything only needed by some functions (json,
+# hashlib, logging, ...) is imported where it is used,
+# `python3 scripts/bench.py --importtime` checks that it stays that way
+from collections import OrderedDict
 from io import StringIO
-import logging
-import json
-import re
-from typing import *
-from ast import literal_eval
-from dataclasses import dataclass, fields, is_dataclass, make_dataclass
+import sys
+import time
+from functools import lru_cache
+from typing import Any, Callable, Dict, FrozenSet, Iterable, List, Optional, Tuple, TypeVar, Union
+from dataclasses import MISSING, dataclass, fields, is_dataclass, make_dataclass
 
 try:
-    from typing_extensions import Protocol, Literal
-except ImportError:
-    pass
+    from typing import Protocol, Literal  # type: ignore
+except ImportError:  # python < 3.8
+    from typing_extensions import Protocol, Literal  # type: ignore
 
 T = TypeVar("T")
 
-log = logging.getLogger(__name__)
-if __debug__:
-    log.setLevel(logging.DEBUG)
+
+class _LazyLogger:
+    """
+    Stands for logging.getLogger(__name__), logging is imported on first use
+    """
+
+    def __getattr__(self, name):
+        import logging
+
+        return getattr(logging.getLogger(__name__), name)
+
+
+log = _LazyLogger()
 
 
 class Dataclass(Protocol):
@@ -406,7 +420,8 @@ def parse_dc_typecheck(cls: Dataclass, data: dict, ignore_unknows=False) -> Data
     fields_ = {f.name: f.type for f in fields(cls)}
     for k, v in data.items():
         # avoid python mangling
-        k = re.sub(r"^__", f"_{cls.__name__}__", k)
+        if k.startswith("__"):
+            k = f"_{cls.__name__}{k}"
         if k not in fields_:
             msg = "Unknow field {} for {}. Expected one of ({})".format(
                 k, cls.__name__, ",".join(fields_.keys())
@@ -418,79 +433,293 @@ def parse_dc_typecheck(cls: Dataclass, data: dict, ignore_unknows=False) -> Data
             raise TypeError(msg)
         if v is None:
             continue
-        typev = fields_[k]
-        is_literal = False
-        # @FIXME
-        # This code is bad, lift this to another
-        # function that returns the concrete_type
-        if hasattr(typev, "__origin__"):
-            if typev.__origin__ in (list, List):
-                concrete_typev = list
-                list_subtype = unpack_union(typev)
-            elif typev.__origin__ in (dict, Dict):
-                concrete_typev = dict
-                dict_subtype_key = typev.__args__[0]
-                dict_subtype_val = typev.__args__[1]
-            elif typev.__origin__ in (Union,):
-                concrete_typev = unpack_union(fields_[k])
-            elif typev.__origin__ is Literal:
-                is_literal = True
-                literals = typev.__args__
-            else:
-                raise NotImplementedError(
-                    f"Can't find a way to determine concrete type for {v}"
-                )
+        convert, _ = _field_converter(cls, fields_[k])
+        res[k] = convert(v)
+    try:
+        return cls(**res)
+    except TypeError as e:
+        raise TypeError(
+            f"while calling {cls.__name__}(**data) with this data {data}: {e}"
+        ) from e
+
+
+@lru_cache(maxsize=1024)
+def _field_converter(cls, typev) -> Tuple[Callable[[Any], Any], Any]:
+    """
+    Return a function converting a decoded json value to a field of type
+    typev, following the rules of parse_dc_typecheck, and the concrete type
+    used for it (None for literals). Converters are cached, so each field
+    type is only inspected once per dataclass
+    """
+    literals = None
+    if hasattr(typev, "__origin__"):
+        if typev.__origin__ in (list, List):
+            concrete_typev = list
+            list_subtype = unpack_union(typev)
+        elif typev.__origin__ in (dict, Dict):
+            concrete_typev = dict
+            dict_subtype_key = typev.__args__[0]
+            dict_subtype_val = typev.__args__[1]
+        elif typev.__origin__ in (Union,):
+            concrete_typev = unpack_union(typev)
+        elif typev.__origin__ is Literal or typev.__origin__ is getattr(
+            # on python < 3.10.1 typing_extensions.Literal is not typing.Literal
+            sys.modules.get("typing_extensions"), "Literal", Literal
+        ):
+            literals = typev.__args__
         else:
-            # typing_extensions.Literal has no __origin__
-            if str(typev).startswith("typing_extensions.Literal"):
-                is_literal = True
-                literals = literal_eval(
-                    str(typev).replace("typing_extensions.Literal", "")
-                )
-            else:
-                concrete_typev = typev
-        scalar = (float, int, bool, str)
-        if is_literal:
+            raise NotImplementedError(
+                f"Can't find a way to determine concrete type for {typev}"
+            )
+    else:
+        # typing_extensions.Literal has no __origin__
+        if str(typev).startswith("typing_extensions.Literal"):
+            from ast import literal_eval
+
+            literals = literal_eval(str(typev).replace("typing_extensions.Literal", ""))
+        else:
+            concrete_typev = typev
+    scalar = (float, int, bool, str)
+    if literals is not None:
+
+        def convert(v):
             if v not in literals:
                 raise TypeError(
                     f"while creating Literal for dataclass {cls.__name__}, it seems that {v} is not in literal values {literals}"
                 )
-            res[k] = v
-        elif is_dataclass(concrete_typev):
-            res[k] = parse_dc(concrete_typev, v)
-        elif issubclass(concrete_typev, scalar):
+            return v
+
+        return convert, None
+    elif is_dataclass(concrete_typev):
+
+        def convert(v):
+            return parse_dc(concrete_typev, v)
+
+    elif issubclass(concrete_typev, scalar):
+
+        def convert(v):
             try:
-                res[k] = concrete_typev(v)
+                return concrete_typev(v)
             except ValueError as e:
                 raise TypeError(
                     f"in dataclass {cls.__name__}, {repr(v)} is not {concrete_typev.__name__}: {e}"
                 ) from e
-        elif concrete_typev is list:
+
+    elif concrete_typev is list:
+
+        def convert(v):
             try:
-                res[k] = [list_subtype(x) for x in v]
+                return [list_subtype(x) for x in v]
             except ValueError as e:
                 raise TypeError(
                     f"in dataclass {cls.__name__} while trying to construct a list of type {list_subtype} with values [{', '.join(v)}]: {e}"
                 ) from e
-        elif concrete_typev is dict:
-            res[k] = {dict_subtype_key(k): dict_subtype_val(v) for k, v in v.items()}
-        elif callable(concrete_typev):
+
+    elif concrete_typev is dict:
+
+        def convert(v):
+            return {dict_subtype_key(k): dict_subtype_val(v) for k, v in v.items()}
+
+    elif callable(concrete_typev):
+
+        def convert(v):
             try:
-                res[k] = concrete_typev(v)
+                return concrete_typev(v)
             except TypeError as e:
                 raise TypeError(
                     f" in dataclass {cls.__name__} while trying to construct value from {concrete_typev.__name__}({repr(v)}): {e}"
                 ) from e
+
+    else:
+        raise NotImplementedError(
+            "This should never happen, please open an issue with an stack trace"
+        )
+    return convert, concrete_typev
+
+
+_typecodes = {bool: "b", int: "q", float: "d"}
+
+
+@dataclass
+class Columns:
+    """
+    Struct of arrays returned by `parse_columns`. `columns` maps each field
+    name to its column and `nulls` maps each Optional field to a mask where
+    1 means the value was null (the column holds a 0, "" or None there)
+    """
+
+    columns: Dict[str, Any]
+    nulls: Dict[str, bytearray]
+    length: int = 0
+
+    def to_numpy(self) -> Dict[str, Any]:
+        """
+        Hand the columns over to NumPy. Numeric and bool columns share
+        memory with the arrays, nullable ones become masked arrays. Raises
+        ImportError if numpy is not installed
+
+        ```python
+        >>> try:
+        ...     import numpy
+        ... except ImportError:
+        ...     numpy = None
+        >>> @dataclass
+        ... class Point:
+        ...     x: float
+        ...     label: Optional[str] = None
+        >>> def check(records):
+        ...     cols = parse_columns(Point, records)
+        ...     arrays = cols.to_numpy()
+        ...     return (
+        ...         arrays["x"].tolist() == cols.columns["x"].tolist()
+        ...         and arrays["label"].mask.tolist() == [bool(b) for b in cols.nulls["label"]]
+        ...         and arrays["label"].compressed().tolist() == [
+        ...             l for l, null in zip(cols.columns["label"], cols.nulls["label"]) if not null
+        ...         ]
+        ...     )
+        >>> numpy is None or check([{"x": 1}, {"x": 2.5, "label": "b"}])
+        True
+        >>> numpy is None or check([])
+        True
+
+        ```
+        """
+        import array
+        import numpy as np
+
+        def frombuffer(buf, dtype):
+            # old numpy versions refuse empty buffers
+            return np.frombuffer(buf, dtype=dtype) if len(buf) else np.empty(0, dtype=dtype)
+
+        res = {}
+        for name, col in self.columns.items():
+            if isinstance(col, array.array):
+                dtype = np.bool_ if col.typecode == "b" else np.dtype(col.typecode)
+                arr = frombuffer(col, dtype)
+            else:
+                arr = np.array(col, dtype=object)
+            if name in self.nulls:
+                mask = frombuffer(self.nulls[name], np.bool_)
+                arr = np.ma.masked_array(arr, mask=mask)
+            res[name] = arr
+        return res
+
+
+def parse_columns(cls: Dataclass, records: Iterable[dict], ignore_unknows=False) -> Columns:
+    """
+    Parse a batch of records into columns, without building one dataclass
+    per record. Values are checked and converted with the same rules as
+    `parse_dc_typecheck`. Numeric and bool fields become `array.array`s,
+    str fields lists of interned strings and anything else a plain list.
+    Optional fields and fields defaulting to None get a null mask, a missing
+    field without a default is an error even if it is Optional. An int
+    column holding a value out of the int64 range becomes a plain list
+
+    ```python
+    >>> @dataclass
+    ... class Fact:
+    ...     text: str
+    ...     __v: int
+    ...     deleted: bool
+    ...     user: Optional[str] = None
+    >>> cols = parse_columns(Fact, [
+    ...     {"text": "meow", "__v": "1", "deleted": False, "user": "bob"},
+    ...     {"text": "purr", "__v": 2, "deleted": True},
+    ... ])
+    >>> cols.length
+    2
+    >>> cols.columns["_Fact__v"], cols.columns["deleted"]
+    (array('q', [1, 2]), array('b', [0, 1]))
+    >>> cols.columns["user"], cols.nulls["user"]
+    (['bob', ''], bytearray(b'\\x00\\x01'))
+    >>> parse_columns(Fact, [{"text": "meow", "__v": "one", "deleted": False}])
+    Traceback (most recent call last):
+    ...
+    TypeError: in dataclass Fact, 'one' is not int: invalid literal for int() with base 10: 'one'
+    >>> @dataclass
+    ... class Big:
+    ...     n: int
+    ...     m: int = None
+    >>> @dataclass
+    ... class Maybe:
+    ...     user: Optional[str]
+    >>> parse_columns(Maybe, [{"user": None}]).nulls
+    {'user': bytearray(b'\\x01')}
+    >>> parse_columns(Maybe, [{}])
+    Traceback (most recent call last):
+    ...
+    TypeError: in dataclass Maybe, missing value for user in {}
+    >>> cols = parse_columns(Big, [{"n": 1}, {"n": 2**70, "m": 3}])
+    >>> cols.columns, cols.nulls
+    ({'n': [1, 1180591620717411303424], 'm': array('q', [0, 3])}, {'m': bytearray(b'\\x01\\x00')})
+
+    ```
+    """
+    from array import array
+
+    flds = fields(cls)
+    converters = {}
+    columns: Dict[str, Any] = {}
+    nulls: Dict[str, bytearray] = {}
+    placeholders = {}
+    for f in flds:
+        convert, concrete = _field_converter(cls, f.type)
+        typecode = _typecodes.get(concrete)  # type: ignore
+        if typecode is not None:
+            columns[f.name] = array(typecode)
+            placeholders[f.name] = concrete()
+        elif concrete is str:
+            columns[f.name] = []
+            convert = lambda v, convert=convert: sys.intern(convert(v))
+            placeholders[f.name] = ""
         else:
-            raise NotImplementedError(
-                "This should never happen, please open an issue with an stack trace"
-            )
-    try:
-        return cls(**res)
-    except TypeError as e:
-        raise TypeError(
-            f"while calling {cls.__name__}(**data) with this data {data}: {e}"
-        ) from e
+            columns[f.name] = []
+            placeholders[f.name] = None
+        converters[f.name] = convert
+        if f.default is None or (
+            getattr(f.type, "__origin__", None) is Union and type(None) in f.type.__args__
+        ):
+            nulls[f.name] = bytearray()
+    length = 0
+    for data in records:
+        row = {}
+        for k, v in data.items():
+            # avoid python mangling
+            if k.startswith("__"):
+                k = f"_{cls.__name__}{k}"
+            if k not in converters:
+                if ignore_unknows:
+                    continue
+                raise TypeError(
+                    "Unknow field {} for {}. Expected one of ({})".format(
+                        k, cls.__name__, ",".join(converters.keys())
+                    )
+                )
+            row[k] = None if v is None else converters[k](v)
+        for f in flds:
+            name = f.name
+            value = row.get(name, MISSING)
+            if value is None or value is MISSING:
+                if f.default is not MISSING:
+                    value = f.default
+                elif f.default_factory is not MISSING:  # type: ignore
+                    value = f.default_factory()  # type: ignore
+                elif value is MISSING or name not in nulls:
+                    raise TypeError(
+                        f"in dataclass {cls.__name__}, missing value for {name} in {data}"
+                    )
+            if name in nulls:
+                nulls[name].append(value is None)
+                if value is None:
+                    value = placeholders[name]
+            col = columns[name]
+            try:
+                col.append(value)
+            except OverflowError:
+                # out of int64 range, parse_dc_typecheck takes it so we do too
+                columns[name] = col.tolist() + [value]
+        length += 1
+    return Columns(columns, nulls, length)
 
 
 _created_dataclasses = {}
@@ -579,10 +808,12 @@ def fromjson(dcname: str, jsondata: str):
     Just a helper, it calls json.loads on jsondata
     before calling fromdict
     """
+    import json
+
     return fromdict(dcname, json.loads(jsondata))
 
 
-def parse_dc(dc, data, strict=True):
+def parse_dc(dc, data, strict=True, only=None):
     """
     Build tree of dataclasses initialized with data
 
@@ -631,8 +862,40 @@ def parse_dc(dc, data, strict=True):
     >>> Date(d="20010101T00:00Z").d
 
 
+    ```
+
+    If you only need a few fields from a big document pass the paths you
+    want in `only`. The result is an instance of a projection of `dc` (see
+    `project_dc`), only the requested paths are converted and everything
+    else in data is not even looked at, so unknow fields outside of them
+    are never reported. Subtrees that you ask for as a whole are parsed
+    with `parse_dc(..., strict=strict)`
+    ```python
+    >>> @dataclass
+    ... class User:
+    ...     name: str
+    ...     age: int
+    >>> @dataclass
+    ... class Doc:
+    ...     user: User
+    ...     text: str
+    ...     __v: int
+    >>> data = {"user": {"name": "bob", "age": 1}, "text": "...", "__v": 0, "num": 1}
+    >>> parse_dc(Doc, data, only=["__v", "user.name"])
+    Doc(user=User(name='bob'), _Doc__v=0)
+    >>> data["user"]["num"] = 1
+    >>> parse_dc(Doc, data, only=["user"], strict=False)
+    Doc(user=User(name='bob', age=1))
+    >>> parse_dc(Doc, data, only=["user"])
+    Traceback (most recent call last):
+    ...
+    TypeError: Unknow field num for User(name,age)
+
     ```
     """
+    if only is not None:
+        proj = project_dc(dc, only)
+        return _parse_projection(proj, data, strict)
     flds = {f.name: f.type for f in fields(dc)}
     cpy = data.copy()
     for k, v in data.items():
@@ -643,7 +906,7 @@ def parse_dc(dc, data, strict=True):
                 del cpy[k]
                 k = new_k
             else:
-                log.warn(f"Unknow field {k}={v} for {dc.__name__}")
+                log.warning("Unknow field %s=%s for %s", k, v, dc.__name__)
                 if strict:
                     fields_ = ",".join([
                         f"{t.name}" for t in fields(dc)
@@ -656,6 +919,390 @@ def parse_dc(dc, data, strict=True):
     return dc(**cpy)
 
 
+def _only_tree(only) -> dict:
+    """
+    Turn dotted paths into a tree of dicts, a None leaf means the
+    whole subtree was requested
+
+    >>> _only_tree(["a.b", "a.c", "d", "d.e"])
+    {'a': {'b': None, 'c': None}, 'd': None}
+    """
+    tree: dict = {}
+    for path in only:
+        node = tree
+        *parents, leaf = path.split(".")
+        for part in parents:
+            child = node.setdefault(part, {})
+            if child is None:
+                break
+            node = child
+        else:
+            node[leaf] = None
+    return tree
+
+
+def _project_dc(dc, tree: dict):
+    flds = {f.name: f for f in fields(dc)}
+    requested = {}
+    for key, sub in tree.items():
+        name = key
+        if name not in flds and name.startswith("__"):
+            name = f"_{dc.__name__}{key}"
+        if name not in flds:
+            fields_ = ",".join(flds.keys())
+            raise TypeError(f"Unknow field {key} for {dc.__name__}({fields_})")
+        requested[name] = (key, sub)
+    proj_fields = []
+    paths = {}
+    # keep the field order of dc, whatever the order of the paths
+    for name, f in flds.items():
+        if name not in requested:
+            continue
+        key, sub = requested[name]
+        type_ = f.type
+        if sub is not None:
+            if not is_dataclass(type_):
+                raise TypeError(
+                    f"Can't project {key} of {dc.__name__}, {type_} is not a dataclass"
+                )
+            type_ = _cached_projection(type_, frozenset(_tree_paths(sub)))
+        proj_fields.append((name, type_))
+        paths[name] = (key, sub is not None, flds[name])
+    # carry the methods of dc over, but not the ones made by @dataclass
+    namespace = {
+        k: v for k, v in vars(dc).items()
+        if k not in flds and k not in _dataclass_attrs
+    }
+    namespace["__reduce__"] = _reduce_projection
+    post_init = namespace.get("__post_init__")
+    if post_init is not None:
+        dropped = [f"'{name}'" for name in flds if name not in requested]
+
+        def __post_init__(self):
+            try:
+                post_init(self)
+            except AttributeError as e:
+                # __post_init__ got to a field that is not in the projection
+                if not any(name in str(e) for name in dropped):
+                    raise
+
+        namespace["__post_init__"] = __post_init__
+    proj = make_dataclass(
+        dc.__name__, proj_fields, namespace=namespace,
+        frozen=dc.__dataclass_params__.frozen,
+    )
+    proj.__module__ = dc.__module__
+    proj.__qualname__ = dc.__qualname__
+    proj.__resguard_projection__ = paths
+    proj.__resguard_source__ = (dc, tuple(sorted(_tree_paths(tree))))
+    return proj
+
+
+_dataclass_attrs = {
+    "__init__", "__repr__", "__eq__", "__hash__", "__setattr__", "__delattr__",
+    "__lt__", "__le__", "__gt__", "__ge__", "__dataclass_fields__",
+    "__dataclass_params__", "__match_args__", "__slots__", "__dict__",
+    "__weakref__", "__module__", "__qualname__", "__annotations__", "__doc__",
+}
+
+
+def _tree_paths(tree: dict, prefix=""):
+    for key, sub in tree.items():
+        if sub is None:
+            yield prefix + key
+        else:
+            yield from _tree_paths(sub, f"{prefix}{key}.")
+
+
+def _reduce_projection(self):
+    dc, only = type(self).__resguard_source__
+    state = {f.name: getattr(self, f.name) for f in fields(self)}
+    return _unpickle_projection, (dc, only, state)
+
+
+def _unpickle_projection(dc, only, state):
+    obj = object.__new__(project_dc(dc, only))
+    for name, value in state.items():
+        object.__setattr__(obj, name, value)
+    return obj
+
+
+def project_dc(dc, only):
+    """
+    Derive a dataclass from `dc` holding only the fields named by the dotted
+    paths in `only`. Nested dataclasses are projected too. The fields keep
+    the order they have in `dc` and the most recently used projections are
+    cached, so asking for the same paths twice gives the same class.
+
+    The projection keeps the methods of `dc`. Its `__post_init__` runs too,
+    up to the first field it uses that is not in the projection
+
+    >>> @dataclass
+    ... class Status:
+    ...     verified: bool
+    ...     sentCount: int
+    >>> @dataclass
+    ... class Fact:
+    ...     text: str
+    ...     status: Status
+    >>> Proj = project_dc(Fact, ["status.verified"])
+    >>> [(f.name, [g.name for g in fields(f.type)]) for f in fields(Proj)]
+    [('status', ['verified'])]
+    >>> Proj is project_dc(Fact, ["status.verified"])
+    True
+    >>> Proj = project_dc(Fact, ["status", "text"])
+    >>> [f.name for f in fields(Proj)], Proj is project_dc(Fact, ["text", "status"])
+    (['text', 'status'], True)
+    >>> project_dc(Fact, ["text.len"])
+    Traceback (most recent call last):
+    ...
+    TypeError: Can't project text of Fact, <class 'str'> is not a dataclass
+    >>> @dataclass
+    ... class Loud:
+    ...     a: str
+    ...     b: str
+    ...     def __post_init__(self):
+    ...         self.a = self.a.upper()
+    ...         self.b = self.b.upper()
+    >>> parse_dc(Loud, {"a": "a", "b": "b"}, only=["a"])
+    Loud(a='A')
+    >>> parse_dc(Loud, {"a": "a", "b": "b"}, only=["b"])
+    Loud(b='b')
+    >>> project_dc(Fact, "text")
+    Traceback (most recent call last):
+    ...
+    TypeError: only must be a list of paths, not a str
+    """
+    if isinstance(only, str):
+        raise TypeError("only must be a list of paths, not a str")
+    return _cached_projection(dc, frozenset(only))
+
+
+@lru_cache(maxsize=256)
+def _cached_projection(dc, only: FrozenSet[str]):
+    return _project_dc(dc, _only_tree(only))
+
+
+def _parse_projection(proj, data, strict=True):
+    res = {}
+    for name, (key, nested, orig) in proj.__resguard_projection__.items():
+        try:
+            v = data[key]
+        except KeyError:
+            if orig.default is not MISSING:
+                res[name] = orig.default
+            elif orig.default_factory is not MISSING:  # type: ignore
+                res[name] = orig.default_factory()  # type: ignore
+            else:
+                raise TypeError(f"Missing field {key} for {proj.__name__}")
+            continue
+        type_ = proj.__dataclass_fields__[name].type
+        if v is None:
+            res[name] = v
+        elif nested:
+            res[name] = _parse_projection(type_, v, strict)
+        elif is_dataclass(type_):
+            res[name] = parse_dc(type_, v, strict)
+        else:
+            res[name] = v
+    return proj(**res)
+
+
+_mutable_types = (list, dict, set, bytearray)
+
+
+def _mutable_part(value, where="") -> Optional[str]:
+    """
+    Describe what makes value mutable, or None if it is immutable all the
+    way down
+    """
+    if is_dataclass(value):
+        name = type(value).__name__
+        if not value.__dataclass_params__.frozen:
+            return f"{name} must be a frozen dataclass"
+        for f in fields(value):
+            mutable = _mutable_part(getattr(value, f.name), f"{name}.{f.name}")
+            if mutable is not None:
+                return mutable
+    elif isinstance(value, _mutable_types):
+        return f"{where} is a mutable {type(value).__name__}"
+    elif isinstance(value, (tuple, frozenset)):
+        for item in value:
+            mutable = _mutable_part(item, where)
+            if mutable is not None:
+                return mutable
+    return None
+
+
+class ParseCache:
+    """
+    A bounded LRU cache of parsed responses. It maps a dataclass plus the
+    hash of the raw body (or an ETag that you got from the server) to the
+    instance built from it, so byte identical bodies are decoded and parsed
+    only once. Entries are evicted when there are more than `maxsize` of
+    them, when the bodies add up to more than `maxbytes` or when they are
+    older than `ttl` seconds. Any of the bounds can be None to disable it.
+    A body bigger than `maxbytes` is parsed but not cached
+
+    Cached instances are shared between callers, so they must be immutable
+    all the way down: TypeError is raised when the dataclass, or one nested
+    in the parsed instance, is not frozen, or when a field holds a list,
+    dict or set. The cache can be shared between threads
+
+    ```python
+    >>> @dataclass(frozen=True)
+    ... class Foo:
+    ...     foo: int
+    >>> cache = ParseCache(maxsize=2)
+    >>> a = cache.parse_dc_typecheck(Foo, '{"foo": "1"}')
+    >>> a
+    Foo(foo=1)
+    >>> a is cache.parse_dc_typecheck(Foo, b'{"foo": "1"}')
+    True
+    >>> cache.parse_dc(Foo, '{"foo": "1"}')
+    Foo(foo='1')
+    >>> cache.hits, cache.misses, cache.evictions
+    (1, 2, 0)
+
+    ```
+
+    With an ETag the body isn't even hashed, the ETag is the key
+    ```python
+    >>> cache.parse_dc(Foo, '{"foo": 2}', etag='"v2"')
+    Foo(foo=2)
+    >>> cache.parse_dc(Foo, '{"foo": 3}', etag='"v2"')
+    Foo(foo=2)
+    >>> cache.hits, cache.misses, cache.evictions, len(cache)
+    (2, 3, 1, 2)
+
+    ```
+
+    A body that alone is over `maxbytes` doesn't push the others out
+    ```python
+    >>> cache = ParseCache(maxsize=10, maxbytes=100)
+    >>> for i in range(5):
+    ...     _ = cache.parse_dc(Foo, '{"foo": %d}' % i)
+    >>> cache.parse_dc(Foo, '{"foo": "%s"}' % ("x" * 200)).foo == "x" * 200
+    True
+    >>> len(cache), cache.evictions
+    (5, 0)
+
+    ```
+
+    Mutable dataclasses are refused
+    ```python
+    >>> @dataclass
+    ... class Bar:
+    ...     bar: int
+    >>> cache.parse_dc(Bar, '{"bar": 1}')
+    Traceback (most recent call last):
+    ...
+    TypeError: ParseCache shares parsed instances, Bar must be a frozen dataclass
+    >>> @dataclass(frozen=True)
+    ... class Baz:
+    ...     bar: Bar
+    >>> cache.parse_dc(Baz, '{"bar": {"bar": 1}}')
+    Traceback (most recent call last):
+    ...
+    TypeError: ParseCache shares parsed instances, Bar must be a frozen dataclass
+    >>> @dataclass(frozen=True)
+    ... class Tags:
+    ...     tags: List[str]
+    >>> cache.parse_dc_typecheck(Tags, '{"tags": ["a"]}')
+    Traceback (most recent call last):
+    ...
+    TypeError: ParseCache shares parsed instances, Tags.tags is a mutable list
+
+    ```
+    """
+
+    def __init__(self, maxsize: Optional[int] = 128, maxbytes: Optional[int] = None,
+                 ttl: Optional[float] = None):
+        self.maxsize = maxsize
+        self.maxbytes = maxbytes
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.nbytes = 0
+        self._entries: "OrderedDict[Any, Tuple[Any, int, float]]" = OrderedDict()
+        import threading
+
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.nbytes = 0
+
+    def parse_dc(self, dc, body: Union[str, bytes], etag: Optional[str] = None, **kwargs):
+        """
+        Cached `parse_dc(dc, json.loads(body), **kwargs)`
+        """
+        return self._parse(parse_dc, dc, body, etag, kwargs)
+
+    def parse_dc_typecheck(self, cls, body: Union[str, bytes], etag: Optional[str] = None,
+                           **kwargs):
+        """
+        Cached `parse_dc_typecheck(cls, json.loads(body), **kwargs)`
+        """
+        return self._parse(parse_dc_typecheck, cls, body, etag, kwargs)
+
+    def _parse(self, parser, dc, body, etag, kwargs):
+        import hashlib
+        import json
+
+        if not dc.__dataclass_params__.frozen:
+            raise TypeError(
+                f"ParseCache shares parsed instances, {dc.__name__} must be a frozen dataclass"
+            )
+        if isinstance(body, str):
+            body = body.encode()
+        if etag is None:
+            digest = hashlib.blake2b(body, digest_size=16).digest()
+        else:
+            digest = etag
+        key = (parser, dc, tuple(sorted(
+            (k, tuple(v) if isinstance(v, list) else v) for k, v in kwargs.items()
+        )), digest)
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                value, _, created = entry
+                if self.ttl is None or now - created < self.ttl:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return value
+                self._evict(key)
+            self.misses += 1
+        value = parser(dc, json.loads(body), **kwargs)
+        mutable = _mutable_part(value)
+        if mutable is not None:
+            raise TypeError(f"ParseCache shares parsed instances, {mutable}")
+        if self.maxbytes is not None and len(body) > self.maxbytes:
+            return value
+        with self._lock:
+            if key in self._entries:  # another thread parsed it meanwhile
+                return self._entries[key][0]
+            self._entries[key] = (value, len(body), now)
+            self.nbytes += len(body)
+            while self._entries and (
+                (self.maxsize is not None and len(self._entries) > self.maxsize)
+                or (self.maxbytes is not None and self.nbytes > self.maxbytes)
+            ):
+                self._evict(next(iter(self._entries)))
+        return value
+
+    def _evict(self, key):
+        _, size, _ = self._entries.pop(key)
+        self.nbytes -= size
+        self.evictions += 1
+
+
 if __name__ == "__main__":
     import doctest
     import sys
@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+import sys
+import os
+import tracemalloc
+from argparse import ArgumentParser
+from subprocess import check_output, STDOUT
+from timeit import timeit
+from dataclasses import dataclass
+from typing import Optional
+BASE_PATH = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.append(BASE_PATH)
+from resguard import parse_dc_typecheck, parse_columns
+
+# Modules that `import resguard` must not pull in, they are imported
+# lazily by the functions that need them
+LAZY = ["logging", "json", "hashlib", "threading", "array"]
+if sys.version_info >= (3, 8):
+    LAZY.append("typing_extensions")
+
+
+def importtime():
+    """
+    Import resguard in a fresh interpreter with -X importtime, print how long
+    it took and return the LAZY modules that got imported anyway
+    """
+    env = {k: v for k, v in os.environ.items() if k != "PYTHONDONTWRITEBYTECODE"}
+    cmd = [sys.executable, "-X", "importtime", "-c", "import resguard"]
+    check_output(cmd, cwd=BASE_PATH, env=env, stderr=STDOUT)  # warm the bytecode cache
+    out = check_output(cmd, cwd=BASE_PATH, env=env, stderr=STDOUT).decode()
+    imported = {}
+    for line in out.splitlines():
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        if self_us.strip().isdigit():
+            imported[name.strip()] = int(cumulative_us)
+    if "resguard" not in imported:
+        sys.exit(f"no -X importtime output for resguard, got:\n{out}")
+    print(f"import resguard: {imported['resguard'] / 1000:.1f}ms")
+    return [name for name in LAZY if name in imported]
+
+
+parser = ArgumentParser(description="resguard benchmarks")
+parser.add_argument("records", type=int, nargs="?", default=100_000)
+parser.add_argument("--importtime", action="store_true",
+                    help="only check that importing resguard stays slim")
+args = parser.parse_args()
+N = args.records
+
+if sys.version_info < (3, 7):
+    print("-X importtime needs python 3.7, skipping the import check", file=sys.stderr)
+    eager = []
+else:
+    eager = importtime()
+if eager:
+    print(f"import resguard pulled in {', '.join(eager)}", file=sys.stderr)
+    sys.exit(1)
+if args.importtime:
+    sys.exit(0)
+
+
+@dataclass
+class Fact:
+    _id: str
+    __v: int
+    text: str
+    deleted: bool
+    source: str
+    used: bool
+    user: Optional[str] = None
+
+
+records = [
+    {
+        "_id": f"591f9894d369931519ce{i:04x}",
+        "__v": i,
+        "text": "A female cat will be pregnant for approximately 9 weeks",
+        "deleted": False,
+        "source": "api",
+        "used": i % 2 == 0,
+        "user": None if i % 3 else "bob",
+    }
+    for i in range(N)
+]
+
+
+def rows():
+    return [parse_dc_typecheck(Fact, r) for r in records]
+
+
+def columns():
+    return parse_columns(Fact, records)
+
+
+for func in (rows, columns):
+    secs = timeit(func, number=1)
+    tracemalloc.start()
+    res = func()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del res
+    print(f"{func.__name__:>8}: {secs:.3f}s {peak / 2**20:.1f}MiB peak for {N} records")
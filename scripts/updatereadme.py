@@ -11,7 +11,7 @@ from subprocess import check_output
 print("[![Build Status](https://travis-ci.org/dhilst/resguard.svg?branch=master)](https://travis-ci.org/dhilst/resguard)")
 print(resguard.__doc__)
 print()
-for func in 'parse_dc create_base unpack_union Dataclass'.split():
+for func in 'parse_dc project_dc ParseCache parse_columns create_base unpack_union Dataclass'.split():
     fp = getattr(resguard, func)
     dcstr = fp.__doc__
     print(f"# {func}{signature(fp)}")